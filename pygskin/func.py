@@ -2,12 +2,42 @@
 
 
 def bind(func, *bind_args, **bind_kwargs):
-    """Bind arguments to a function."""
+    """Bind arguments to a function.
+
+    Use ``...`` as a placeholder for positional arguments supplied at call time.
+
+    >>> bind(divmod, ..., 3)(7)
+    (2, 1)
+    >>> bind(divmod, 7)(3)
+    (2, 1)
+    >>> class Foo:
+    ...     bar = bind(lambda x, self: (x, type(self).__name__), 1)
+    >>> Foo().bar()
+    (1, 'Foo')
+    >>> bind(divmod, ..., ...)(7)
+    Traceback (most recent call last):
+    ...
+    TypeError: expected at least 2 positional arguments, got 1
+    """
+    placeholders = [i for i, arg in enumerate(bind_args) if arg is ...]
+    if not placeholders:
+        # a plain function, unlike functools.partial, still binds as a method
+        def _bound_fn(*args, **kwargs):
+            return func(*bind_args, *args, **(bind_kwargs | kwargs))
+
+        return _bound_fn
+
+    num_placeholders = len(placeholders)
 
     def _bound_fn(*args, **kwargs):
-        kwargs = bind_kwargs | kwargs
-        iargs = iter(args)
-        args = (next(iargs) if arg is ... else arg for arg in bind_args)
-        return func(*args, *iargs, **kwargs)
+        if len(args) < num_placeholders:
+            raise TypeError(
+                f"expected at least {num_placeholders} positional arguments, "
+                f"got {len(args)}"
+            )
+        bound_args = list(bind_args)
+        for i, arg in zip(placeholders, args, strict=False):
+            bound_args[i] = arg
+        return func(*bound_args, *args[num_placeholders:], **(bind_kwargs | kwargs))
 
     return _bound_fn
@@ -34,8 +34,6 @@ def make_color_gradient(
         stripe = Surface((width, 1), pygame.constants.SRCALPHA)
         quotient = 1 / width
 
-    stripe.fill((0, 0, 0, 0))
-
     for i, pos in enumerate(positions):
         q = i * quotient
         if easing_fn:
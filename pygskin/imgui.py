@@ -1,10 +1,15 @@
 """A simple immediate mode GUI for Pygame."""
 
 import contextlib
-import inspect
+import itertools
+import sys
+from collections.abc import Callable
 from dataclasses import dataclass
 from dataclasses import field
-from enum import Enum
+from functools import cache
+from functools import lru_cache
+from types import CodeType
+from types import FrameType
 from typing import Any
 
 import pygame
@@ -13,6 +18,7 @@ from pygame.locals import K_BACKSPACE
 from pygame.locals import K_TAB
 from pygame.locals import KEYDOWN
 from pygame.locals import KMOD_SHIFT
+from pygame.typing import Point
 
 from pygskin.rect import add_padding
 from pygskin.rect import get_rect_attrs
@@ -25,12 +31,120 @@ HAS_BORDER = 16
 HAS_BACKGROUND = 32
 HAS_SHADOW = 64
 
+HOVER = 1
+ACTIVE = 2
+FOCUS = 4
 
-Align = Enum("Align", "left center right")
-VAlign = Enum("VAlign", "top middle bottom")
+_ALIGN_ATTRS = {"left": "left", "center": "centerx", "right": "right"}
+_VALIGN_ATTRS = {"top": "top", "middle": "centery", "bottom": "bottom"}
 
 
-@dataclass
+@cache
+def _get_font(size: int) -> pygame.font.Font:
+    return pygame.font.Font(None, size)
+
+
+# only the default fonts are memoised; caller fonts are mutable (size, bold...)
+@lru_cache(maxsize=512)
+def _render_text(font_size: int, text: str, color: tuple) -> pygame.Surface:
+    return _get_font(font_size).render(text, True, color)
+
+
+@lru_cache(maxsize=1024)
+def _measure_text(font_size: int, text: str) -> tuple[int, int]:
+    return _get_font(font_size).size(text)
+
+
+@lru_cache(maxsize=128)
+def _render_rect(
+    size: tuple[int, int],
+    color: tuple,
+    width: int = 0,
+    border_radius: int = 0,
+) -> pygame.Surface:
+    image = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.draw.rect(
+        image,
+        color,
+        image.get_rect(),
+        width=width,
+        border_radius=border_radius,
+    )
+    return image
+
+
+@lru_cache(maxsize=128)
+def _render_chrome(
+    size: tuple[int, int],
+    background_color: tuple | None,
+    border_color: tuple | None,
+    border_width: int = 1,
+    border_radius: int = 0,
+) -> pygame.Surface:
+    image = pygame.Surface(size, pygame.SRCALPHA)
+    rect = image.get_rect()
+    if background_color:
+        pygame.draw.rect(image, background_color, rect, border_radius=border_radius)
+    if border_color:
+        pygame.draw.rect(
+            image,
+            border_color,
+            rect,
+            width=border_width,
+            border_radius=border_radius,
+        )
+    return image
+
+
+_next_callsite_id = itertools.count()
+
+
+def _get_callsite_id(frame: FrameType) -> int:
+    return _get_code_callsite_id(frame.f_code, frame.f_lasti)
+
+
+# bounded so code objects of discarded callers are not kept alive; an evicted
+# callsite gets a fresh id, never one already handed out
+@lru_cache(maxsize=1024)
+def _get_code_callsite_id(code: CodeType, offset: int) -> int:
+    return next(_next_callsite_id)
+
+
+@lru_cache(maxsize=256)
+def _parse_color(color: str) -> tuple:
+    return tuple(pygame.Color(color))
+
+
+def _rgba(color) -> tuple:
+    if isinstance(color, str):
+        return _parse_color(color)
+    return tuple(pygame.Color(color))
+
+
+def _is_opaque(color: tuple | None) -> bool:
+    return color is None or color[3] == 255
+
+
+def _flush_blits(surface: pygame.Surface, blits: list) -> None:
+    if blits:
+        surface.fblits(blits)
+        blits.clear()
+
+
+def _get_tuple_text(value: tuple) -> str | None:
+    if len(value) == 2 and isinstance(value[0], str):
+        return value[0]
+    return None
+
+
+_TEXT_GETTERS: dict[type, Callable[[Any], str | None]] = {
+    str: str,
+    list: "".join,
+    tuple: _get_tuple_text,
+}
+
+
+@dataclass(slots=True)
 class Widget:
     """Immediate mode GUI widget."""
 
@@ -41,15 +155,44 @@ class Widget:
     type: str | None = None
     id: str | None = None
     classes: list[str] = field(default_factory=list)
-    pseudo_classes: set[str] = field(default_factory=set)
+    pseudo_classes: int = 0
+    _text: str | None = field(default=None, init=False, repr=False, compare=False)
+
+
+def _get_widget_text(widget: Widget) -> str | None:
+    if widget._text is None:
+        value = widget.value
+        if get_text := _TEXT_GETTERS.get(type(value)) or _get_text_getter(value):
+            widget._text = get_text(value)
+    return widget._text
+
 
+def _get_text_getter(value: Any) -> Callable[[Any], str | None] | None:
+    # subclasses miss the exact-type lookup
+    if isinstance(value, str | list):
+        return "".join
+    if isinstance(value, tuple):
+        return _get_tuple_text
+    return None
 
-def _draw_widget(widget: Widget, surface: pygame.Surface, **style) -> None:
-    if "focus" in widget.pseudo_classes:
-        _draw_widget_focus(surface, widget, **style)
-    _draw_widget_background(surface, widget, **style)
-    _draw_widget_border(surface, widget, **style)
-    _draw_widget_text(surface, widget, **style)
+
+def _draw_widget(
+    widget: Widget,
+    surface: pygame.Surface,
+    blits: list,
+    style: dict,
+) -> None:
+    if widget.pseudo_classes & FOCUS:
+        _draw_widget_focus(surface, blits, widget, style)
+    for draw in _get_draw_stages(widget.flags):
+        draw(surface, blits, widget, style)
+
+
+@cache
+def _get_draw_stages(flags: int) -> tuple[Callable, ...]:
+    if flags & (HAS_BACKGROUND | HAS_BORDER):
+        return (_draw_widget_chrome, _draw_widget_text)
+    return (_draw_widget_text,)
 
 
 def label(text: str | list[str], **kwargs) -> Widget:
@@ -77,7 +220,7 @@ def textfield(text: list[str], **kwargs) -> Widget:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class radio(Widget):  # noqa
     """Create a radio button widget."""
 
@@ -86,24 +229,32 @@ class radio(Widget):  # noqa
     def _draw(
         self,
         surface: pygame.Surface,
+        blits: list,
         has_focus: bool = False,
         checked: bool = False,
         **style,
     ) -> None:
         if has_focus:
-            _draw_widget_focus(surface, self, **style)
-        _draw_widget_background(surface, self, **style)
+            _draw_widget_focus(surface, blits, self, style)
+        _draw_widget_chrome(surface, blits, self, style)
         if self.rect is not None:
             box = self.rect.move_to(
                 width=self.rect.height,
                 right=self.rect.x - 5,
                 y=self.rect.y - self.rect.height * 0.1,
             )
-            pygame.draw.rect(surface, style.get("border_color", "white"), box, 1)
-            if checked:
-                check = pygame.FRect(box).scale_by(0.5)
-                pygame.draw.rect(surface, style.get("border_color", "white"), check)
-        _draw_widget_text(surface, self, **style)
+            color = _rgba(style.get("border_color", "white"))
+            check = box.scale_by(0.5)
+            if _is_opaque(color):
+                blits.append((_render_rect(box.size, color, 1), box.topleft))
+                if checked:
+                    blits.append((_render_rect(check.size, color), check.topleft))
+            else:
+                _flush_blits(surface, blits)
+                pygame.draw.rect(surface, color, box, 1)
+                if checked:
+                    pygame.draw.rect(surface, color, check)
+        _draw_widget_text(surface, blits, self, style)
 
 
 @dataclass
@@ -116,150 +267,250 @@ class IMGUI:
     tabindex_prev: int | None = None
     widgets: dict[int, Widget] = field(default_factory=dict)
     events: list[Event] = field(default_factory=list)
+    blits: list[tuple[pygame.Surface, Point]] = field(default_factory=list)
+    blits_clip: pygame.Rect | None = None
+    keydown_events: list[Event] = field(default_factory=list)
+    mouse_pos: Point = (0, 0)
+    mouse_down: bool = False
+    widget_states: dict[int, tuple] = field(default_factory=dict)
+    prev_widget_states: dict[int, tuple] = field(default_factory=dict)
+    dirty_rects: list[pygame.Rect] = field(default_factory=list)
+
+
+def _flush_queued_blits(ui: IMGUI, surface: pygame.Surface) -> None:
+    # queued blits are drawn under the clip they were queued with
+    if ui.blits:
+        clip = surface.get_clip()
+        surface.set_clip(ui.blits_clip)
+        _flush_blits(surface, ui.blits)
+        surface.set_clip(clip)
 
 
 @contextlib.contextmanager
-def render(ui: IMGUI, surface: pygame.Surface, get_styles=None):
-    """Render the GUI."""
-    yield get_renderer(ui, surface, get_styles)
+def render(
+    ui: IMGUI,
+    surface: pygame.Surface,
+    get_styles=None,
+    *,
+    batch: bool = False,
+):
+    """Render the GUI.
+
+    Each widget is drawn to the surface as it is rendered. With `batch`, widgets
+    are queued and drawn in a single call when the context exits, or earlier if
+    the surface clip changes. Anything else drawn on the surface inside the
+    `with` block then ends up underneath the widgets.
+
+    The rects of widgets that were triggered, appeared, disappeared, or whose
+    hover/active/focus state, rect or text changed since the previous frame, are
+    collected in `ui.dirty_rects`, e.g. for passing to `pygame.display.update()`
+    when nothing else on screen changed. Other style changes are not tracked.
+    """
+    try:
+        yield get_renderer(ui, surface, get_styles, batch=batch)
+    finally:
+        _flush_queued_blits(ui, surface)
+    prev_widget_states = ui.prev_widget_states
+    for widget_id in prev_widget_states.keys() - ui.widget_states.keys():
+        ui.dirty_rects.append(pygame.Rect(prev_widget_states[widget_id][1]))
     ui.hot = None
-    if not pygame.mouse.get_pressed()[0]:
+    if not ui.mouse_down:
         ui.active = None
     elif ui.active is None:
         ui.active = -1
 
 
-def get_renderer(ui: IMGUI, surface: pygame.Surface, get_styles=None):
-    """Get a rendering function for the GUI."""
+def get_renderer(
+    ui: IMGUI,
+    surface: pygame.Surface,
+    get_styles=None,
+    *,
+    batch: bool = False,
+):
+    """Get a rendering function for the GUI.
+
+    Each widget is drawn to the surface as it is rendered. With `batch`, draws
+    are queued in `ui.blits` instead. The queue is flushed when the surface clip
+    changes, and the caller must flush the rest, as `render` does. Only `render`
+    adds widgets that stopped being rendered to `ui.dirty_rects`.
+    """
+    ui.blits.clear()
+    ui.keydown_events = [ev for ev in ui.events if ev.type == KEYDOWN]
+    ui.mouse_pos = pygame.mouse.get_pos()
+    ui.mouse_down = pygame.mouse.get_pressed()[0]
+    ui.prev_widget_states, ui.widget_states = ui.widget_states, {}
+    ui.dirty_rects = []
 
     def render_fn(widget: Widget, **style) -> Widget:
-        frame_info = inspect.stack()[1]
-        widget_id = hash((frame_info.filename, frame_info.lineno, id(widget.value)))
+        widget_id = (_get_callsite_id(sys._getframe(1)) << 64) + id(widget.value)
         if callable(get_styles):
             style = get_styles(widget) | style
-        with _get_widget(ui, widget_id, widget, **style) as _widget:
-            _draw_widget(widget, surface, **style)
+        with _get_widget(ui, widget_id, widget, style) as _widget:
+            clip = surface.get_clip()
+            # skip drawing widgets (including focus outline) outside the clip area
+            if clip.colliderect(widget.rect.inflate(4, 4)):
+                if clip != ui.blits_clip:
+                    _flush_queued_blits(ui, surface)
+                    ui.blits_clip = clip
+                _draw_widget(widget, surface, ui.blits, style)
+                if not batch:
+                    _flush_blits(surface, ui.blits)
         return _widget.triggered
 
     return render_fn
 
 
 @contextlib.contextmanager
-def _get_widget(ui: IMGUI, widget_id: int, widget: Widget, **kwargs):
-    widget.rect = _get_widget_rect(widget, **kwargs)
+def _get_widget(ui: IMGUI, widget_id: int, widget: Widget, style: dict):
+    widget._text = None
+    widget.rect = _get_widget_rect(widget, style)
     widget.triggered = False
-    widget.pseudo_classes = set()
+    widget.pseudo_classes = 0
 
-    if widget.rect.collidepoint(pygame.mouse.get_pos()):
+    if widget.rect.collidepoint(ui.mouse_pos):
         ui.hot = widget_id
-        widget.pseudo_classes.add("hover")
+        widget.pseudo_classes |= HOVER
 
-    if ui.hot == widget_id and pygame.mouse.get_pressed()[0]:
+    if ui.hot == widget_id and ui.mouse_down:
         ui.active = widget_id
-        widget.pseudo_classes.add("active")
+        widget.pseudo_classes |= ACTIVE
         if widget.flags & CLICKABLE:
             widget.triggered = True
 
     if widget.flags & FOCUSABLE and ui.focus is None:
         ui.focus = widget_id
-        widget.pseudo_classes.add("focus")
+        widget.pseudo_classes |= FOCUS
 
     if ui.focus == widget_id:
-        widget.pseudo_classes.add("focus")
+        widget.pseudo_classes |= FOCUS
         _handle_keys(widget, ui)
 
+    # dirty rects include room for the focus outline
+    state = (
+        widget.pseudo_classes,
+        tuple(widget.rect.inflate(4, 4)),
+        _get_widget_text(widget),
+    )
+    ui.widget_states[widget_id] = state
+    prev_state = ui.prev_widget_states.get(widget_id)
+    if widget.triggered or state != prev_state:
+        ui.dirty_rects.append(pygame.Rect(state[1]))
+        if prev_state and prev_state[1] != state[1]:
+            ui.dirty_rects.append(pygame.Rect(prev_state[1]))
+
     yield widget
 
     if widget.flags & FOCUSABLE:
         ui.tabindex_prev = widget_id
 
 
-def _get_widget_rect(widget: Widget, **kwargs) -> pygame.Rect:
+def _get_widget_rect(widget: Widget, style: dict) -> pygame.Rect:
+    rect_kwargs = get_rect_attrs(style)
     if not widget.rect:
         widget.rect = pygame.Rect(0, 0, 0, 0)
         if isinstance(widget.value, str | list):
-            font = kwargs.setdefault(
-                "font",
-                pygame.font.Font(None, kwargs.get("font_size", 20)),
-            )
-            widget.rect.size = font.size("".join(widget.value))
-        if padding := kwargs.get("padding"):
+            text = _get_widget_text(widget)
+            if font := style.get("font"):
+                widget.rect.size = font.size(text)
+            else:
+                widget.rect.size = _measure_text(style.get("font_size", 20), text)
+        if padding := style.get("padding"):
             widget.rect, _ = add_padding(widget.rect, padding)
-    if rect_kwargs := get_rect_attrs(kwargs):
-        widget.rect = widget.rect.move_to(**rect_kwargs)
+    elif rect_kwargs:
+        # don't move a rect that belongs to the caller
+        widget.rect = widget.rect.copy()
+    for attr, value in rect_kwargs.items():
+        setattr(widget.rect, attr, value)
     return widget.rect
 
 
-def _draw_widget_background(surface: pygame.Surface, widget: Widget, **style) -> None:
-    if widget.flags & HAS_BACKGROUND and widget.rect:
-        color = style.get(
-            "background_color",
-            "white" if "active" in widget.pseudo_classes else "black",
+def _draw_widget_chrome(
+    surface: pygame.Surface,
+    blits: list,
+    widget: Widget,
+    style: dict,
+) -> None:
+    if not widget.rect:
+        return
+    background_color = border_color = None
+    if widget.flags & HAS_BACKGROUND:
+        background_color = _rgba(
+            style.get(
+                "background_color",
+                "white" if widget.pseudo_classes & ACTIVE else "black",
+            )
         )
-        pygame.draw.rect(
-            surface,
-            color,
-            widget.rect,
-            width=0,
-            border_radius=style.get("border_radius", 0),
+    if widget.flags & HAS_BORDER:
+        border_color = _rgba(style.get("border_color", "white"))
+    border_width = style.get("border_width", 1)
+    border_radius = style.get("border_radius", 0)
+    if _is_opaque(background_color) and _is_opaque(border_color):
+        image = _render_chrome(
+            widget.rect.size,
+            background_color,
+            border_color,
+            border_width=border_width,
+            border_radius=border_radius,
         )
-
-
-def _draw_widget_border(surface: pygame.Surface, widget: Widget, **style) -> None:
-    if widget.flags & HAS_BORDER and widget.rect:
+        blits.append((image, widget.rect.topleft))
+        return
+    # translucent colors are written straight to the surface, not blended
+    _flush_blits(surface, blits)
+    if background_color:
         pygame.draw.rect(
-            surface,
-            style.get("border_color", "white"),
-            widget.rect,
-            width=style.get("border_width", 1),
-            border_radius=style.get("border_radius", 0),
+            surface, background_color, widget.rect, border_radius=border_radius
         )
-
-
-def _draw_widget_focus(surface: pygame.Surface, widget: Widget, **style) -> None:
-    if widget.rect:
+    if border_color:
         pygame.draw.rect(
             surface,
-            style.get("focus_border_color", "red"),
-            widget.rect.inflate(4, 4),
-            width=style.get("focus_border_width", 4),
-            border_radius=style.get("focus_border_radius", 0),
+            border_color,
+            widget.rect,
+            width=border_width,
+            border_radius=border_radius,
         )
 
 
-def _draw_widget_text(surface: pygame.Surface, widget: Widget, **style) -> None:
+def _draw_widget_focus(
+    surface: pygame.Surface,
+    blits: list,
+    widget: Widget,
+    style: dict,
+) -> None:
     if not widget.rect:
         return
-    match widget.value:
-        case str() | list():
-            text = "".join(widget.value)
-        case (str(text), _):
-            pass
-        case _:
-            return
-    font = style.setdefault(
-        "font",
-        pygame.font.Font(None, style.get("font_size", 30)),
-    )
-    color = style.get("color", "white")
-    text_img = font.render(text, True, color)
+    rect = widget.rect.inflate(4, 4)
+    color = _rgba(style.get("focus_border_color", "red"))
+    width = style.get("focus_border_width", 4)
+    border_radius = style.get("focus_border_radius", 0)
+    if _is_opaque(color):
+        image = _render_rect(rect.size, color, width, border_radius)
+        blits.append((image, rect.topleft))
+    else:
+        _flush_blits(surface, blits)
+        pygame.draw.rect(surface, color, rect, width=width, border_radius=border_radius)
+
+
+def _draw_widget_text(
+    surface: pygame.Surface,
+    blits: list,
+    widget: Widget,
+    style: dict,
+) -> None:
+    if not widget.rect or (text := _get_widget_text(widget)) is None:
+        return
+    color = _rgba(style.get("color", "white"))
+    if font := style.get("font"):
+        text_img = font.render(text, True, color)
+    else:
+        text_img = _render_text(style.get("font_size", 30), text, color)
     rect = text_img.get_rect(center=widget.rect.center)
-    match Align[style.get("align", "center")]:
-        case Align.left:
-            rect.left = widget.rect.left
-        case Align.right:
-            rect.right = widget.rect.right
-        case _:
-            rect.centerx = widget.rect.centerx
-    match VAlign[style.get("valign", "middle")]:
-        case VAlign.top:
-            rect.top = widget.rect.top
-        case VAlign.bottom:
-            rect.bottom = widget.rect.bottom
-        case _:
-            rect.centery = widget.rect.centery
-    _, rect = add_padding(rect, style.get("padding", 0))
-    surface.blit(text_img, rect)
+    attr = _ALIGN_ATTRS[style.get("align", "center")]
+    setattr(rect, attr, getattr(widget.rect, attr))
+    attr = _VALIGN_ATTRS[style.get("valign", "middle")]
+    setattr(rect, attr, getattr(widget.rect, attr))
+    if padding := style.get("padding"):
+        _, rect = add_padding(rect, padding)
+    blits.append((text_img, rect.topleft))
 
 
 def _handle_keys(widget: Widget, ui: IMGUI) -> None:
@@ -269,7 +520,7 @@ def _handle_keys(widget: Widget, ui: IMGUI) -> None:
     value = widget.value
     value_len = len(widget.value)
 
-    for event in (ev for ev in ui.events if ev.type == KEYDOWN):
+    for event in ui.keydown_events:
         if event.key == K_TAB:
             if focus and focused_widget == widget:
                 ui.focus = None
@@ -278,9 +529,12 @@ def _handle_keys(widget: Widget, ui: IMGUI) -> None:
             # prevent this event from being processed by other widgets
             event.key = 0
         if editable and event.key == K_BACKSPACE:
-            value[:] = value[:-1]
+            if value:
+                value.pop()
             value_len = len(value)
+            widget._text = None
             widget.triggered = True
         if editable and 32 <= event.key < 127 and value_len < 30:
             value.append(event.unicode)
+            widget._text = None
             widget.triggered = True
@@ -1,7 +1,6 @@
 """Module for defining remappable controls."""
 
 from collections.abc import Callable
-from functools import partial
 
 from pygame.event import Event
 
@@ -12,18 +11,66 @@ def match_event(event: Event, other: Event) -> bool:
 
 
 def get_action_mapper(mapping: dict[str, Event]) -> Callable[[Event], str | None]:
-    """Return a function that maps input events to actions."""
+    """Return a function that maps input events to actions.
+
+    The mapping is read on every call, so remapped controls apply immediately.
+
+    >>> from pygame.locals import KEYDOWN, K_UP, K_w
+    >>> mapping = {"up": Event(KEYDOWN, key=K_UP)}
+    >>> get_action = get_action_mapper(mapping)
+    >>> get_action(Event(KEYDOWN, key=K_UP))
+    'up'
+    >>> mapping["up"] = Event(KEYDOWN, key=K_w)
+    >>> get_action(Event(KEYDOWN, key=K_UP)) is None
+    True
+    >>> get_action(Event(KEYDOWN, key=K_w))
+    'up'
+    """
 
     def get_action(event: Event) -> str | None:
-        is_match = partial(match_event, event)
         for action, input_ in mapping.items():
-            if input_ and is_match(input_):
+            if input_ and match_event(event, input_):
                 return action
         return None
 
     return get_action
 
 
+def _get_inputs_by_type(mapping: dict[str, Event]) -> dict[int, dict[str, Event]]:
+    inputs_by_type: dict[int, dict[str, Event]] = {}
+    for action, input_ in mapping.items():
+        if input_:
+            inputs_by_type.setdefault(input_.type, {})[action] = input_
+    return inputs_by_type
+
+
 def map_inputs_to_actions(mapping: dict[str, Event], events: list[Event]) -> list[str]:
-    """Return a list of actions from the given events."""
-    return list(filter(None, map(get_action_mapper(mapping), events)))
+    """Return a list of actions from the given events.
+
+    The mapping is bucketed by event type once per call, so each event is only
+    compared against the inputs of the same type.
+
+    >>> from pygame.locals import KEYDOWN, K_SPACE, K_UP, MOUSEBUTTONDOWN
+    >>> mapping = {
+    ...     "jump": Event(KEYDOWN, key=K_SPACE),
+    ...     "up": Event(KEYDOWN, key=K_UP),
+    ...     "fire": Event(MOUSEBUTTONDOWN, button=1),
+    ... }
+    >>> map_inputs_to_actions(mapping, [
+    ...     Event(KEYDOWN, key=K_UP, mod=0),
+    ...     Event(MOUSEBUTTONDOWN, button=3),
+    ...     Event(MOUSEBUTTONDOWN, button=1, pos=(0, 0)),
+    ... ])
+    ['up', 'fire']
+    """
+    if not events:
+        return []
+    mappers = {
+        event_type: get_action_mapper(inputs)
+        for event_type, inputs in _get_inputs_by_type(mapping).items()
+    }
+    return [
+        action
+        for event in events
+        if (get_action := mappers.get(event.type)) and (action := get_action(event))
+    ]
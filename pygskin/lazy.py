@@ -1,13 +1,13 @@
 """A lazy object."""
 
 from collections.abc import Callable
-from functools import cache
 from functools import partial
 from typing import Any
 from typing import Generic
 from typing import TypeVar
 
 T = TypeVar("T")
+_UNSET = object()
 
 
 class lazy(Generic[T]):  # noqa: N801
@@ -32,14 +32,22 @@ class lazy(Generic[T]):  # noqa: N801
     <class 'pygskin.lazy.lazy'>
     """
 
+    __slots__ = ("_loader", "_loaded", "__weakref__")
+
     def __init__(self, loader: Callable[[], T], *args, **kwargs) -> None:
-        self._loader = cache(partial(loader, *args, **kwargs))
+        self._loader = partial(loader, *args, **kwargs)
+        self._loaded = _UNSET
 
     def _load(self) -> T:
-        return self._loader()
+        if self._loaded is _UNSET:
+            self._loaded = self._loader()
+        return self._loaded
 
     def __getattr__(self, name: str) -> Any:
-        return getattr(self._load(), name)
+        loaded = self._loaded
+        if loaded is _UNSET:
+            loaded = self._load()
+        return getattr(loaded, name)
 
     def __setattr__(self, name: str, value: Any) -> None:
         if name.startswith("_load"):
@@ -59,7 +67,10 @@ class lazy(Generic[T]):  # noqa: N801
 
     @property
     def __class__(self) -> type:
-        return self._load().__class__
+        loaded = self._loaded
+        if loaded is _UNSET:
+            loaded = self._load()
+        return loaded.__class__
 
     @__class__.setter
     def __class__(self, cls: type) -> None:
@@ -17,12 +17,12 @@ def scroll_parallax_layers(
 ) -> None:
     """Scroll the layers of the parallax effect by the given vector."""
     vx, vy = vector[0], vector[1]
-    layers = get_layers()
-    for layer in layers:
-        speed = speeds.get(layer, 1)
-        lvx, lvy = vx * speed, vy * speed
+    get_speed = speeds.get
+    for layer in get_layers():
+        speed = get_speed(layer, 1)
+        lvx, lvy = vx * speed, -vy * speed
         for sprite in get_sprites_from_layer(layer):
             if rect := sprite.rect:
-                rect.move_ip(lvx, -lvy)
+                rect.move_ip(lvx, lvy)
                 rect.x %= rect.width
                 rect.y %= rect.height
@@ -47,17 +47,18 @@ def channel(fn: Callable | None = None) -> Callable:
     subscriber 1: bar
     """
 
-    subscribers: list[Callable] = []
+    subscribers: tuple[Callable, ...] = ()
 
     def subscribe(subscriber: Callable) -> None:
         """Subscribe to the message."""
-        subscribers.append(subscriber)
+        nonlocal subscribers
+        subscribers += (subscriber,)
 
     def wrapper(*args, **kwargs) -> Any:
         """Publish the message."""
         cancel = CANCEL
         for subscriber in subscribers:
-            if subscriber(*args, **kwargs) == cancel:
+            if subscriber(*args, **kwargs) is cancel:
                 break
         else:
             if fn:
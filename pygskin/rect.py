@@ -7,7 +7,7 @@ from typing import overload
 from pygame import Rect
 from pygame.typing import IntPoint
 
-RECT_ATTRS = """
+RECT_ATTRS = frozenset("""
     x y
     top left bottom right
     topleft bottomleft topright bottomright
@@ -15,7 +15,7 @@ RECT_ATTRS = """
     center centerx centery
     size width height
     w h
-""".strip().split()
+""".strip().split())
 
 
 def get_rect_attrs(d: dict) -> dict:
@@ -28,25 +28,44 @@ def add_padding(
     padding: int | Sequence[int] = 0,
 ) -> tuple[Rect, Rect]:
     """Add padding to a rectangle."""
-    match padding:
-        case int(px):
-            return rect.inflate(px * 2, px * 2), rect.move(px, px)
-
-        case Sequence() as p if 1 <= len(p) <= 4 and all(isinstance(i, int) for i in p):
-            try:
-                it = iter(p)
-                top = right = bottom = left = next(it)
-                right = left = next(it)
-                bottom = next(it)
-                left = next(it)
-            except StopIteration:
-                pass
-            return (
-                rect.inflate(left + right, top + bottom).move_to(
-                    top=rect.top - top, left=rect.left - left
-                ),
-                rect.move(left, top),
+    if isinstance(padding, int):
+        return rect.inflate(padding * 2, padding * 2), rect.move(padding, padding)
+
+    if isinstance(padding, Sequence):
+        n = len(padding)
+        if n == 1:
+            top = right = bottom = left = padding[0]
+            valid = isinstance(top, int)
+        elif n == 2:
+            top, right = padding
+            bottom, left = top, right
+            valid = isinstance(top, int) and isinstance(right, int)
+        elif n == 3:
+            top, right, bottom = padding
+            left = right
+            valid = (
+                isinstance(top, int)
+                and isinstance(right, int)
+                and isinstance(bottom, int)
             )
+        elif n == 4:
+            top, right, bottom, left = padding
+            valid = (
+                isinstance(top, int)
+                and isinstance(right, int)
+                and isinstance(bottom, int)
+                and isinstance(left, int)
+            )
+        else:
+            valid = False
+        if not valid:
+            raise ValueError("Invalid padding")
+        return (
+            rect.inflate(left + right, top + bottom).move_to(
+                top=rect.top - top, left=rect.left - left
+            ),
+            rect.move(left, top),
+        )
 
     raise ValueError("Invalid padding")
 
@@ -68,6 +87,17 @@ def grid(
     """
 
     cellw, cellh = rect.width // columns, rect.height // rows
+    cells = [
+        Rect(column * cellw, row * cellh, cellw, cellh)
+        for row in range(rows)
+        for column in range(columns)
+    ]
+    named = {
+        key: row * columns + column
+        for key, (column, row) in (names or {}).items()
+        if 0 <= column < columns and 0 <= row < rows
+    }
+    indices: dict[tuple, int] = {}
 
     @overload
     def get_cell(key: str) -> Rect: ...
@@ -76,16 +106,21 @@ def grid(
     def get_cell(column: int, row: int) -> Rect: ...
 
     def get_cell(*args, **_) -> Rect:
-        match args:
-            case (str(key),) if names and key in names:
-                coord = names[key]
-                column, row = coord[0], coord[1]
-            case (int(column), int(row)):
-                ...
-            case _:
-                raise KeyError(*args)
-        if not (0 <= column < columns and 0 <= row < rows):
-            raise KeyError(*args)
-        return Rect(column * cellw, row * cellh, cellw, cellh)
+        # key on argument types too, as (1, 1) == (1.0, 1.0)
+        memo_key = (args, *map(type, args))
+        try:
+            index = indices[memo_key]
+        except (KeyError, TypeError):
+            match args:
+                case (str(key),) if key in named:
+                    index = named[key]
+                case (int(column), int(row)) if (
+                    0 <= column < columns and 0 <= row < rows
+                ):
+                    index = row * columns + column
+                case _:
+                    raise KeyError(*args) from None
+            indices[memo_key] = index
+        return Rect(cells[index])
 
     return get_cell
@@ -17,11 +17,12 @@ def shake(
         direction = Vector2(1, 0)
 
     _magnitude = magnitude
+    sin = math.sin
 
     def _shake(quotient: float) -> Vector2:
         nonlocal _magnitude
 
-        sine_wave = math.sin(quotient)
+        sine_wave = sin(quotient)
         _noise = Vector2(uniform(-1, 1), uniform(-1, 1)) * noise
         offset = (direction * sine_wave + _noise).clamp_magnitude(1) * _magnitude
         _magnitude = max(0, _magnitude - dampening)
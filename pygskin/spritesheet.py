@@ -1,14 +1,20 @@
 """Access cells in a spritesheet."""
 
 from collections.abc import Callable
-from functools import cache
+from contextlib import suppress
 
 from pygame import Surface
+from pygame.typing import IntPoint
 
 from pygskin.rect import grid
 
 
-def spritesheet(image: Surface, *args, **kwargs) -> Callable[..., Surface]:
+def spritesheet(
+    image: Surface,
+    rows: int = 1,
+    columns: int = 1,
+    names: dict[str, IntPoint] | None = None,
+) -> Callable[..., Surface]:
     """Return a function to access cells in a spritesheet.
 
     >>> image = Surface((20, 10))
@@ -24,10 +30,24 @@ def spritesheet(image: Surface, *args, **kwargs) -> Callable[..., Surface]:
     True
     """
 
-    get_cell = grid(image.get_rect(), *args, **kwargs)
-
-    @cache
-    def get_subsurface(*args, **kwargs) -> Surface:
-        return image.subsurface(get_cell(*args, **kwargs))
+    get_cell = grid(image.get_rect(), rows, columns, names)
+
+    # keys include the argument types, as (1, 0) == (1.0, 0.0)
+    subsurfaces: dict[tuple, Surface] = {
+        ((column, row), int, int): image.subsurface(get_cell(column, row))
+        for row in range(rows)
+        for column in range(columns)
+    }
+    for name, (column, row) in (names or {}).items():
+        cell_key = ((column, row), type(column), type(row))
+        if cell_key in subsurfaces:
+            subsurfaces[((name,), type(name))] = subsurfaces[cell_key]
+
+    def get_subsurface(*args, **_) -> Surface:
+        key = (args, *map(type, args))
+        with suppress(KeyError, TypeError):
+            return subsurfaces[key]
+        subsurface = subsurfaces[key] = image.subsurface(get_cell(*args))
+        return subsurface
 
     return get_subsurface
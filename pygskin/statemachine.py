@@ -62,17 +62,22 @@ def statemachine(
     """
 
     reset = RESET
-    state = first_key(transition_table)
+    state = initial = first_key(transition_table)
+    transitions = None
     while state:
         input_ = yield state
         if input_ is reset:
-            state = first_key(transition_table)
+            state = initial
+            transitions = None
             yield None
             continue
-        transitions = transition_table[state]
+        if transitions is None:
+            transitions = transition_table[state]
         for transition in transitions:
             if next_state := transition(input_):
-                state = next_state
+                if next_state != state:
+                    state = next_state
+                    transitions = None
                 break
 
 
@@ -3,8 +3,10 @@ A simple CSS-like stylesheet parser.
 """
 
 import re
+from collections.abc import Callable
 from dataclasses import dataclass
 from dataclasses import field
+from functools import lru_cache
 
 SELECTOR = re.compile(r"(\A|[#.[]|::?)(\*|[a-zA-Z0-9-_]+)(?:=([^]]+))?")
 
@@ -35,15 +37,21 @@ def get_styles(stylesheet: dict[str, dict], obj) -> dict:
     >>> get_styles(styles, label)
     {'font_family': 'Arial', 'font_size': 20, 'color': 'red', 'bold': True}
     """
-    rulesets = ((parse_selector(k), v) for k, v in stylesheet.items())
     return {
         property: value
-        for selector, declarations in sorted(rulesets, key=lambda r: specificity(r[0]))
-        for property, value in declarations.items()
-        if match(selector, obj)
+        for key, matches in _compile_selectors(tuple(stylesheet))
+        if matches(obj)
+        for property, value in stylesheet[key].items()
     }
 
 
+@lru_cache(maxsize=32)
+def _compile_selectors(keys: tuple[str, ...]) -> list[tuple[str, Callable]]:
+    rules = [(key, parse_selector(key)) for key in keys]
+    rules.sort(key=lambda rule: specificity(rule[1]))
+    return [(key, _get_matcher(selector)) for key, selector in rules]
+
+
 def parse_selector(s: str) -> Selector:
     """
     Parse a CSS selector.
@@ -54,9 +62,9 @@ def parse_selector(s: str) -> Selector:
     >>> astuple(parse_selector("button#submit.btn.btn-primary[type=submit]"))
     ('button', 'submit', ['btn', 'btn-primary'], {'type': 'submit'}, [])
     """
-    parts = re.findall(SELECTOR, s)
     selector = Selector()
-    for prefix, part, value in parts:
+    for m in SELECTOR.finditer(s):
+        prefix, part, value = m.groups("")
         if prefix == "#":
             selector.id = part
         elif prefix == ".":
@@ -105,13 +113,25 @@ def match(selector: Selector, obj) -> bool:
     >>> match(parse_selector("Image.bar.blue"), el)
     False
     """
-    obj_type = getattr(obj, "type", obj.__class__.__name__)
-    return (
-        (not selector.tag or selector.tag == "*" or obj_type == selector.tag)
-        and (not selector.id or obj.id == selector.id)
-        and all(cls in obj.classes for cls in selector.classes)
-        and all(
-            getattr(obj, key, None) == value
-            for key, value in selector.attributes.items()
+    return _get_matcher(selector)(obj)
+
+
+def _get_matcher(selector: Selector) -> Callable[..., bool]:
+    checks: list[Callable[..., bool]] = []
+    if (tag := selector.tag) and tag != "*":
+        checks.append(lambda obj: getattr(obj, "type", obj.__class__.__name__) == tag)
+    if id_ := selector.id:
+        checks.append(lambda obj: obj.id == id_)
+    for cls in selector.classes:
+        checks.append(lambda obj, cls=cls: cls in obj.classes)
+    for key, value in selector.attributes.items():
+        checks.append(
+            lambda obj, key=key, value=value: getattr(obj, key, None) == value
         )
-    )
+
+    if not checks:
+        return lambda _: True
+    if len(checks) == 1:
+        return checks[0]
+
+    return lambda obj: all(check(obj) for check in checks)